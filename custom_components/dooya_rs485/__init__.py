@@ -1,7 +1,241 @@
+"""The Dooya Curtain Motor integration."""
+import asyncio
+from datetime import timedelta
+import logging
+
 from homeassistant import core
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME, CONF_SCAN_INTERVAL
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+
+from .const import (
+    CONF_DEVICE_ID_H,
+    CONF_DEVICE_ID_L,
+    CONF_TCP_ADDRESS,
+    CONF_TCP_PORT,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    PLATFORMS,
+    UPDATE_INTERVAL,
+)
+from .dooya_rs485 import (
+    MOTOR_STATUS_CLOSING,
+    MOTOR_STATUS_OPENING,
+    DooyaController,
+    DooyaError,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Adaptive polling: poll fast while the motor is moving, back off to the
+# configured scan interval when idle.
+MOVING_UPDATE_INTERVAL = timedelta(seconds=1)
+MOVING_STATES = frozenset((MOTOR_STATUS_OPENING, MOTOR_STATUS_CLOSING))
+# Number of consecutive idle polls before stepping the interval back up,
+# so a brief stop between two movements does not thrash the interval.
+IDLE_TICKS_BEFORE_BACKOFF = 3
+
+# Collapse bursts of async_request_refresh calls (e.g. several cover
+# entities reacting to the same command) into a single gateway query.
+REQUEST_REFRESH_COOLDOWN = 0.25
+
+# Stop touching the network after this many consecutive poll failures,
+# and probe again only after the reset timeout has elapsed.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 60.0
+
+
+class CircuitBreakerOpenError(Exception):
+    """Raised when a call is short-circuited by an open circuit breaker."""
+
+
+class CircuitBreaker:
+    """Minimal CLOSED/OPEN/HALF_OPEN circuit breaker for coroutines.
+
+    While OPEN, execute() raises CircuitBreakerOpenError without running
+    the wrapped coroutine, so a down gateway costs no syscalls and no
+    event-loop stalls on connect timeouts. After reset_timeout one probe
+    call is let through (HALF_OPEN); success closes the circuit again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """Initialize a closed breaker."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+
+    async def execute(self, coro_fn):
+        """Run coro_fn() through the breaker."""
+        if self._opened_at is not None:
+            loop = asyncio.get_running_loop()
+            if loop.time() - self._opened_at < self._reset_timeout:
+                raise CircuitBreakerOpenError
+            # HALF_OPEN: allow a single probe through.
+        try:
+            result = await coro_fn()
+        except Exception:
+            self._failures += 1
+            if self._failures >= self._failure_threshold:
+                self._opened_at = asyncio.get_running_loop().time()
+            raise
+        self._failures = 0
+        self._opened_at = None
+        return result
 
 
 async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
     """Set up the Dooya Curtain Motor component."""
-    # @TODO: Add setup code.
     return True
+
+
+async def async_setup_entry(hass: core.HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up a Dooya curtain motor from a config entry."""
+    config = _connection_config(entry)
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug("Setting up Dooya RS485 entry: %r", config)
+    controller = DooyaController(
+        config[CONF_TCP_ADDRESS],
+        config[CONF_TCP_PORT],
+        config[CONF_DEVICE_ID_L],
+        config[CONF_DEVICE_ID_H],
+    )
+    # No eager connect: the first refresh goes through ensure_connected,
+    # so the gateway handshake happens exactly once. A failed first
+    # refresh raises ConfigEntryNotReady via the coordinator.
+    coordinator = DooyaDataUpdateCoordinator(
+        hass, controller, idle_interval=_idle_interval_from_options(entry)
+    )
+    await coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    domain_data[entry.entry_id] = {
+        "controller": controller,
+        "coordinator": coordinator,
+        # Snapshot of the settings the controller was built from, so
+        # the options listener can tell a reload-worthy change from a
+        # plain scan-interval tweak.
+        "config": config,
+    }
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    return True
+
+
+def _connection_config(entry: ConfigEntry) -> dict:
+    """Return the effective connection settings, options over data."""
+    merged = {**entry.data, **entry.options}
+    return {
+        CONF_NAME: merged.get(CONF_NAME),
+        CONF_TCP_ADDRESS: merged[CONF_TCP_ADDRESS],
+        CONF_TCP_PORT: merged[CONF_TCP_PORT],
+        CONF_DEVICE_ID_L: merged[CONF_DEVICE_ID_L],
+        CONF_DEVICE_ID_H: merged[CONF_DEVICE_ID_H],
+    }
+
+
+def _idle_interval_from_options(entry: ConfigEntry) -> timedelta:
+    """Return the configured idle poll interval for an entry."""
+    return timedelta(
+        seconds=entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    )
+
+
+async def _async_options_updated(hass: core.HomeAssistant, entry: ConfigEntry):
+    """Apply changed options, reloading when connection settings change."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    if _connection_config(entry) != entry_data["config"]:
+        # Name, gateway or device id changed: the controller and entity
+        # must be rebuilt, which only a reload does cleanly.
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    entry_data["coordinator"].set_idle_interval(_idle_interval_from_options(entry))
+
+
+async def async_unload_entry(hass: core.HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload a Dooya curtain motor config entry."""
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        domain_data = hass.data.setdefault(DOMAIN, {})
+        entry_data = domain_data.pop(entry.entry_id, None)
+        if entry_data is not None:
+            await entry_data["controller"].disconnect()
+    return unload_ok
+
+
+class DooyaDataUpdateCoordinator(DataUpdateCoordinator):
+    """Polls the motor status, fast while moving and slowly when idle.
+
+    A fixed 30 s interval is both too slow while the curtain is moving
+    (the UI lags the physical position) and wasteful while it is idle.
+    Instead the interval is stepped down to MOVING_UPDATE_INTERVAL as soon
+    as the motor reports it is running and stepped back up to the
+    configured idle interval after IDLE_TICKS_BEFORE_BACKOFF idle polls.
+    """
+
+    def __init__(
+        self,
+        hass: core.HomeAssistant,
+        controller: DooyaController,
+        idle_interval: timedelta = UPDATE_INTERVAL,
+    ):
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=idle_interval,
+            # The status dict compares equal between idle polls, so HA
+            # can skip listener notification and state writes entirely.
+            always_update=False,
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=REQUEST_REFRESH_COOLDOWN,
+                immediate=False,
+            ),
+        )
+        self.controller = controller
+        self._idle_interval = idle_interval
+        self._breaker = CircuitBreaker(
+            failure_threshold=BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=BREAKER_RESET_TIMEOUT,
+        )
+        self._idle_ticks = 0
+
+    async def _do_poll(self):
+        """Connect if needed and read the full motor status."""
+        await self.controller.ensure_connected()
+        return await self.controller.read_all_status()
+
+    async def _async_update_data(self):
+        """Fetch the full motor status and adapt the poll interval."""
+        try:
+            data = await self._breaker.execute(self._do_poll)
+        except CircuitBreakerOpenError as err:
+            # Gateway is known-down; fail without touching the network
+            # until the breaker half-opens. UpdateFailed lets HA drive
+            # entity availability instead of publishing stale state.
+            raise UpdateFailed("Gateway unreachable, circuit open") from err
+        except DooyaError as err:
+            raise UpdateFailed(f"Error reading motor status: {err}") from err
+
+        if data["motor_status"] in MOVING_STATES:
+            self._idle_ticks = 0
+            self.update_interval = MOVING_UPDATE_INTERVAL
+        else:
+            self._idle_ticks += 1
+            if self._idle_ticks >= IDLE_TICKS_BEFORE_BACKOFF:
+                self.update_interval = self._idle_interval
+        return data
+
+    def set_idle_interval(self, idle_interval: timedelta) -> None:
+        """Apply a new idle poll interval (from the entry options)."""
+        self._idle_interval = idle_interval
+        if self.update_interval != MOVING_UPDATE_INTERVAL:
+            self.update_interval = idle_interval
@@ -0,0 +1,103 @@
+"""Config flow for the Dooya Curtain Motor integration."""
+import voluptuous as vol
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_NAME, CONF_SCAN_INTERVAL
+from homeassistant.core import callback
+
+from .const import (
+    CONF_DEVICE_ID_H,
+    CONF_DEVICE_ID_L,
+    CONF_TCP_ADDRESS,
+    CONF_TCP_PORT,
+    DEFAULT_DEVICE_ID_H,
+    DEFAULT_DEVICE_ID_L,
+    DEFAULT_NAME,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TCP_PORT,
+    DOMAIN,
+)
+
+
+def _coerce_device_id(value):
+    """Parse a device ID byte given as decimal or 0x-prefixed hex."""
+    try:
+        return int(value, 0) if isinstance(value, str) else int(value)
+    except (TypeError, ValueError) as err:
+        raise vol.Invalid(
+            "Device ID must be a decimal or 0x-prefixed hex number"
+        ) from err
+
+
+# A device ID byte: decimal or 0x-prefixed hex, 0-255.
+validate_device_id = vol.All(_coerce_device_id, vol.Range(min=0, max=255))
+
+
+# Shared between the user and options steps; built once at import so no
+# form render pays for voluptuous schema construction.
+_BASE_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME, default=DEFAULT_NAME): str,
+        vol.Required(CONF_TCP_ADDRESS): str,
+        vol.Required(CONF_TCP_PORT, default=DEFAULT_TCP_PORT): int,
+        vol.Required(
+            CONF_DEVICE_ID_L, default=f"0x{DEFAULT_DEVICE_ID_L:02X}"
+        ): validate_device_id,
+        vol.Required(
+            CONF_DEVICE_ID_H, default=f"0x{DEFAULT_DEVICE_ID_H:02X}"
+        ): validate_device_id,
+    }
+)
+
+# The options step additionally exposes the idle poll cadence.
+_OPTIONS_SCHEMA = _BASE_SCHEMA.extend(
+    {
+        vol.Optional(
+            CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+    }
+)
+
+
+class DooyaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
+    """Handle a config flow for a Dooya curtain motor."""
+
+    VERSION = 1
+
+    async def async_step_user(self, user_input=None):
+        """Handle the initial step."""
+        if user_input is not None:
+            # The flow manager has already validated and coerced
+            # user_input against _BASE_SCHEMA.
+            return self.async_create_entry(
+                title=user_input[CONF_NAME], data=user_input
+            )
+
+        return self.async_show_form(step_id="user", data_schema=_BASE_SCHEMA)
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow handler."""
+        return DooyaOptionsFlowHandler(config_entry)
+
+
+class DooyaOptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle options for a configured Dooya curtain motor."""
+
+    def __init__(self, config_entry):
+        """Initialize the options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                _OPTIONS_SCHEMA,
+                {**self.config_entry.data, **self.config_entry.options},
+            ),
+        )
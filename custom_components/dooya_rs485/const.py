@@ -1 +1,20 @@
+"""Constants for the Dooya Curtain Motor integration."""
+from datetime import timedelta
+
+from homeassistant.const import Platform
+
 DOMAIN = "dooya_rs485"
+
+PLATFORMS: tuple[Platform, ...] = (Platform.COVER,)
+UPDATE_INTERVAL = timedelta(seconds=30)
+DEFAULT_SCAN_INTERVAL = 30
+
+CONF_TCP_ADDRESS = "tcp_address"
+CONF_TCP_PORT = "tcp_port"
+CONF_DEVICE_ID_L = "device_id_l"
+CONF_DEVICE_ID_H = "device_id_h"
+
+DEFAULT_NAME = "Dooya Curtain"
+DEFAULT_TCP_PORT = 8899
+DEFAULT_DEVICE_ID_L = 0xFE
+DEFAULT_DEVICE_ID_H = 0xFE
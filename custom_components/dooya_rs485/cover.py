@@ -0,0 +1,218 @@
+"""Cover platform for Dooya RS485 curtain motors."""
+import logging
+from types import MappingProxyType
+
+from homeassistant.components.cover import (
+    CoverDeviceClass,
+    CoverEntity,
+    CoverEntityFeature,
+)
+from homeassistant.const import CONF_NAME
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DEFAULT_NAME, DOMAIN
+from .dooya_rs485 import (
+    MOTOR_STATUS_CLOSING,
+    MOTOR_STATUS_OPENING,
+    MOTOR_STATUS_SETTING,
+    MOTOR_STATUS_STOPPED,
+    DooyaError,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SUPPORTED_FEATURES = (
+    CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE | CoverEntityFeature.STOP
+)
+
+# Position reported by the motor before limits are programmed.
+POSITION_UNKNOWN = 0xFF
+
+# How close (percent) the reported position must be to the target before
+# we consider the movement finished.
+POSITION_TOLERANCE = 5
+
+# Read-only so every entity shares one mapping and the literal values
+# stay interned for the lifetime of the module.
+_MOTOR_STATUS_MAP = MappingProxyType(
+    {
+        MOTOR_STATUS_STOPPED: "stopped",
+        MOTOR_STATUS_OPENING: "opening",
+        MOTOR_STATUS_CLOSING: "closing",
+        MOTOR_STATUS_SETTING: "setting",
+    }
+)
+_DIRECTION_MAP = MappingProxyType({0: "forward", 1: "reverse"})
+_SWITCH_STATUS_MAP = MappingProxyType({0: "released", 1: "triggered"})
+
+# motor_status -> (is_opening, is_closing), one probe instead of two
+# equality comparisons per tick.
+_MOVEMENT_FLAGS = MappingProxyType(
+    {
+        MOTOR_STATUS_OPENING: (True, False),
+        MOTOR_STATUS_CLOSING: (False, True),
+    }
+)
+_NOT_MOVING = (False, False)
+
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Set up the Dooya cover from a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    name = entry.options.get(
+        CONF_NAME, entry.data.get(CONF_NAME, DEFAULT_NAME)
+    )
+    _LOGGER.debug("Adding Dooya cover %s", name)
+    async_add_entities(
+        [
+            DooyaCover(
+                entry_data["coordinator"],
+                entry_data["controller"],
+                name,
+                entry.entry_id,
+            )
+        ]
+    )
+
+
+class DooyaCover(CoordinatorEntity, CoverEntity):
+    """A Dooya curtain motor as a Home Assistant cover."""
+
+    # The HA entity bases are not slotted, so this does not drop the
+    # per-instance __dict__, but it does give the hot-path attributes
+    # direct offset access instead of a dict probe.
+    __slots__ = (
+        "_controller",
+        "_target_position",
+        "_target_low",
+        "_target_high",
+        "_cached_attrs",
+    )
+
+    _attr_device_class = CoverDeviceClass.CURTAIN
+    _attr_supported_features = SUPPORTED_FEATURES | CoverEntityFeature.SET_POSITION
+
+    def __init__(self, coordinator, controller, name, entry_id):
+        """Initialize the cover entity."""
+        super().__init__(coordinator)
+        self._controller = controller
+        self._attr_name = name
+        self._target_low = None
+        self._target_high = None
+        # entry_id is collision-free and stable across renames, unlike a
+        # slug derived from the display name.
+        self._attr_unique_id = f"dooya_{entry_id}"
+        self._target_position = None
+        # Persistent dict, mutated in place on each coordinator tick so
+        # no per-tick dict allocation or rehash of the keys happens.
+        self._cached_attrs = {
+            "motor_status": "unknown",
+            "direction": "unknown",
+            "active_switch": "unknown",
+            "passive_switch": "unknown",
+        }
+        self._attr_current_cover_position = None
+        self._attr_is_closed = None
+        self._attr_is_opening = False
+        self._attr_is_closing = False
+        self._attr_extra_state_attributes = self._cached_attrs
+        self._refresh_cached_state(coordinator.data)
+
+    def _refresh_cached_state(self, data):
+        """Derive position, movement flags and attributes from data.
+
+        HA reads current_cover_position, is_closed, is_opening and
+        is_closing back-to-back on every state write; writing the
+        _attr_* fields here means those reads never enter a property of
+        ours at all. Called from __init__ as well as on coordinator
+        ticks: with always_update=False an idle curtain may never
+        notify after entity creation, so the first population cannot
+        wait for a listener callback.
+        """
+        if not data:
+            return
+        get = data.get
+        position = get("position")
+        if position is None or position == POSITION_UNKNOWN:
+            position = None
+        self._attr_current_cover_position = position
+        self._attr_is_opening, self._attr_is_closing = _MOVEMENT_FLAGS.get(
+            get("motor_status"), _NOT_MOVING
+        )
+        if position is None:
+            self._attr_is_closed = None
+        elif (
+            self._target_position is not None
+            and self._target_low <= position <= self._target_high
+        ):
+            self._attr_is_closed = self._target_position == 0
+        else:
+            self._attr_is_closed = position == 0
+        attrs = self._cached_attrs
+        attrs["motor_status"] = _MOTOR_STATUS_MAP.get(
+            get("motor_status"), "unknown"
+        )
+        attrs["direction"] = _DIRECTION_MAP.get(get("direction"), "unknown")
+        attrs["active_switch"] = _SWITCH_STATUS_MAP.get(
+            get("switch_active"), "unknown"
+        )
+        attrs["passive_switch"] = _SWITCH_STATUS_MAP.get(
+            get("switch_passive"), "unknown"
+        )
+
+    def _set_target(self, position):
+        """Set the movement target and its precomputed tolerance bounds."""
+        self._target_position = position
+        if position is None:
+            self._target_low = None
+            self._target_high = None
+        else:
+            self._target_low = position - POSITION_TOLERANCE
+            self._target_high = position + POSITION_TOLERANCE
+
+    def _handle_coordinator_update(self):
+        """Refresh cached state and attributes once per coordinator tick."""
+        data = self.coordinator.data
+        if data:
+            self._refresh_cached_state(data)
+        super()._handle_coordinator_update()
+
+    async def async_open_cover(self, **kwargs):
+        """Open the cover."""
+        try:
+            await self._controller.open()
+        except DooyaError as err:
+            raise HomeAssistantError(f"Failed to open {self.name}: {err}") from err
+        self._set_target(100)
+        await self.coordinator.async_request_refresh()
+
+    async def async_close_cover(self, **kwargs):
+        """Close the cover."""
+        try:
+            await self._controller.close()
+        except DooyaError as err:
+            raise HomeAssistantError(f"Failed to close {self.name}: {err}") from err
+        self._set_target(0)
+        await self.coordinator.async_request_refresh()
+
+    async def async_stop_cover(self, **kwargs):
+        """Stop the cover."""
+        try:
+            await self._controller.stop()
+        except DooyaError as err:
+            raise HomeAssistantError(f"Failed to stop {self.name}: {err}") from err
+        self._set_target(None)
+        await self.coordinator.async_request_refresh()
+
+    async def async_set_cover_position(self, **kwargs):
+        """Move the cover to a specific position."""
+        position = kwargs["position"]
+        try:
+            await self._controller.set_cover_position(position)
+        except DooyaError as err:
+            raise HomeAssistantError(
+                f"Failed to set position of {self.name}: {err}"
+            ) from err
+        self._set_target(position)
+        await self.coordinator.async_request_refresh()
@@ -0,0 +1,86 @@
+"""Tests for the polling circuit breaker."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.dooya_rs485 import (  # noqa: E402
+    CircuitBreaker,
+    CircuitBreakerOpenError,
+)
+
+
+class _Boom(Exception):
+    """Sentinel failure raised by the fake poll."""
+
+
+async def _fail():
+    raise _Boom
+
+
+def test_breaker_stays_closed_below_threshold():
+    """Failures below the threshold do not open the circuit."""
+
+    async def scenario():
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60.0)
+        for _ in range(2):
+            with pytest.raises(_Boom):
+                await breaker.execute(_fail)
+
+        async def ok():
+            return "data"
+
+        assert await breaker.execute(ok) == "data"
+
+    asyncio.run(scenario())
+
+
+def test_breaker_opens_and_short_circuits():
+    """Reaching the threshold opens the circuit without running calls."""
+
+    async def scenario():
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60.0)
+        for _ in range(2):
+            with pytest.raises(_Boom):
+                await breaker.execute(_fail)
+        calls = 0
+
+        async def probe():
+            nonlocal calls
+            calls += 1
+
+        with pytest.raises(CircuitBreakerOpenError):
+            await breaker.execute(probe)
+        assert calls == 0
+
+    asyncio.run(scenario())
+
+
+def test_breaker_half_open_transitions():
+    """After the reset timeout one probe runs; its outcome decides."""
+
+    async def scenario():
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        with pytest.raises(_Boom):
+            await breaker.execute(_fail)
+        with pytest.raises(CircuitBreakerOpenError):
+            await breaker.execute(_fail)
+
+        # A failed half-open probe reopens the circuit.
+        await asyncio.sleep(0.06)
+        with pytest.raises(_Boom):
+            await breaker.execute(_fail)
+        with pytest.raises(CircuitBreakerOpenError):
+            await breaker.execute(_fail)
+
+        # A successful probe closes it again.
+        await asyncio.sleep(0.06)
+
+        async def ok():
+            return "data"
+
+        assert await breaker.execute(ok) == "data"
+        assert await breaker.execute(ok) == "data"
+
+    asyncio.run(scenario())
@@ -0,0 +1,106 @@
+"""Tests for the Dooya RS485 controller module."""
+import pytest
+
+from custom_components.dooya_rs485 import dooya_rs485 as controller
+
+
+def _frame(payload):
+    """Return payload with a valid CRC-16/MODBUS trailer appended."""
+    return payload + controller.DooyaController.calculate_crc(payload)
+
+
+@pytest.fixture(params=["python", "native"])
+def crc_impl(request, monkeypatch):
+    """Run the test against both CRC implementations."""
+    if request.param == "python":
+        monkeypatch.setattr(controller, "_crc16", controller._crc16_py)
+    elif controller._crc16 is controller._crc16_py:
+        pytest.skip("fastcrc not installed")
+
+
+def test_crc_ok_accepts_valid_frame(crc_impl):
+    """A frame with a correct trailing CRC validates."""
+    frame = _frame(bytes([0x55, 0xFE, 0xFE, 0x01, 0x02, 0x64]))
+    assert controller._crc_ok(frame)
+
+
+def test_crc_ok_rejects_corrupt_frame(crc_impl):
+    """A single flipped payload bit fails validation."""
+    frame = bytearray(_frame(bytes([0x55, 0xFE, 0xFE, 0x01, 0x02, 0x64])))
+    frame[4] ^= 0x01
+    assert not controller._crc_ok(bytes(frame))
+
+
+def test_crc16_py_known_vectors():
+    """The table-driven CRC matches published CRC-16/MODBUS values."""
+    assert controller._crc16_py(b"") == 0xFFFF
+    assert controller._crc16_py(b"123456789") == 0x4B37
+    assert controller._crc16_py(b"\x01\x04\x02\xFF\xFF") == 0x80B8
+
+
+def test_crc16_table_matches_bitwise_reference():
+    """The precomputed table agrees with the bit-serial definition."""
+
+    def reference(data):
+        crc = 0xFFFF
+        for byte in data:
+            crc ^= byte
+            for _ in range(8):
+                if crc & 0x0001:
+                    crc = (crc >> 1) ^ 0xA001
+                else:
+                    crc >>= 1
+        return crc
+
+    data = bytes(range(256))
+    assert controller._crc16_py(data) == reference(data)
+
+
+def test_calculate_crc_is_little_endian():
+    """calculate_crc serializes the checksum low byte first."""
+    crc = controller.DooyaController.calculate_crc(b"123456789")
+    assert crc == (0x4B37).to_bytes(2, "little")
+
+
+def test_expected_response_len():
+    """Reads size by register count; writes and controls are fixed."""
+    expected_len = controller.DooyaController._expected_response_len
+    assert expected_len(controller._READ_STATUS_BLOCK) == 11
+    assert expected_len(controller._READ_SWITCH_ACTIVE) == 8
+    assert expected_len(controller._CMD_OPEN) == 8
+    assert expected_len(controller._CMD_STOP) == 8
+
+
+def _read_response(register, data):
+    """Build a valid read response frame carrying the given data bytes."""
+    return _frame(bytes([0x55, 0xFE, 0xFE, 0x01, register]) + bytes(data))
+
+
+def test_extract_data_returns_data_view():
+    """_extract_data yields exactly the data bytes of the response."""
+    response = _read_response(0x02, [0x64, 0x01, 0x00, 0x00])
+    data = controller.DooyaController._extract_data(response, 0x02, 4)
+    assert bytes(data) == bytes([0x64, 0x01, 0x00, 0x00])
+
+
+def test_extract_data_rejects_short_response():
+    """A truncated response raises DooyaResponseError."""
+    response = _read_response(0x02, [0x64])
+    with pytest.raises(controller.DooyaResponseError):
+        controller.DooyaController._extract_data(response, 0x02, 4)
+
+
+def test_extract_data_rejects_wrong_register():
+    """A response for another register raises DooyaResponseError."""
+    response = _read_response(0x03, [0x00])
+    with pytest.raises(controller.DooyaResponseError):
+        controller.DooyaController._extract_data(response, 0x02, 1)
+
+
+def test_build_frame_is_cached_and_valid():
+    """_build_frame returns CRC-valid frames and memoizes them."""
+    device = controller.DooyaController("host", 8899, 0xFE, 0xFE)
+    frame = device._build_frame(controller._CMD_OPEN)
+    assert frame[:3] == bytes([controller.START_BYTE, 0xFE, 0xFE])
+    assert controller._crc_ok(frame)
+    assert device._build_frame(controller._CMD_OPEN) is frame